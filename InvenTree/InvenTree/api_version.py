@@ -2,11 +2,15 @@
 
 
 # InvenTree API version
-INVENTREE_API_VERSION = 130
+INVENTREE_API_VERSION = 131
 
 """
 Increment this API version number whenever there is a significant change to the API that any clients need to know about
 
+v131 -> 2023-08-14
+    - Adds 'background' option to the BOM download endpoint
+    - Adds endpoint for downloading the result of a background BOM export
+
 v130 -> 2023-07-14 : https://github.com/inventree/InvenTree/pull/5251
     - Refactor label printing interface
 
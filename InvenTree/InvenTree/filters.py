@@ -133,6 +133,18 @@ class InvenTreeOrderingFilter(filters.OrderingFilter):
         return ordering
 
 
+class InvenTreeNoHTMLFilterBackend(rest_filters.DjangoFilterBackend):
+    """DjangoFilterBackend which does not render a filter form in the browsable API.
+
+    Rendering the filter form may require additional database queries (e.g. to populate choice fields),
+    which are not required for API clients.
+    """
+
+    def to_html(self, request, queryset, view):
+        """Do not render the filter form."""
+        return ''
+
+
 SEARCH_ORDER_FILTER = [
     rest_filters.DjangoFilterBackend,
     InvenTreeSearchFilter,
@@ -149,3 +161,9 @@ ORDER_FILTER = [
     rest_filters.DjangoFilterBackend,
     filters.OrderingFilter,
 ]
+
+SEARCH_ORDER_FILTER_NO_HTML = [
+    InvenTreeNoHTMLFilterBackend,
+    InvenTreeSearchFilter,
+    filters.OrderingFilter,
+]
@@ -10,10 +10,46 @@ from django.template.loaders.cached import Loader as CachedLoader
 class InvenTreeTemplateLoader(CachedLoader):
     """Custom template loader which bypasses cache for PDF export"""
 
+    def __init__(self, engine, loaders):
+        """Initialize the loader, with a separate cache for file-modified templates"""
+        super().__init__(engine, loaders)
+        self.modified_template_cache = {}
+
+    def reset(self):
+        """Reset any cached template objects"""
+        super().reset()
+        self.modified_template_cache = {}
+
+    def get_modified_template(self, template_name, template, skip=None):
+        """Return a template object, which is only reloaded if the underlying file has changed.
+
+        The template is cached against the modification time, size and inode of the template file,
+        so that the file is only re-read and re-parsed when it has actually been updated
+        (or replaced with a different file).
+        """
+        try:
+            stat = os.stat(template.origin.name)
+        except (OSError, TypeError, ValueError):
+            # Template does not map to a file on disk - reload without cache
+            return BaseLoader.get_template(self, template_name, skip)
+
+        file_info = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+        key = self.cache_key(template_name, skip)
+        cached = self.modified_template_cache.get(key, None)
+
+        if cached is not None and cached[0] == file_info:
+            return cached[1]
+
+        template = BaseLoader.get_template(self, template_name, skip)
+        self.modified_template_cache[key] = (file_info, template)
+
+        return template
+
     def get_template(self, template_name, skip=None):
         """Return a template object for the given template name.
 
-        Any custom report or label templates will be forced to reload (without cache).
+        Any custom report or label templates will be reloaded if the template file has been modified.
         This ensures that generated PDF reports / labels are always up-to-date.
         """
 
@@ -29,8 +65,8 @@ class InvenTreeTemplateLoader(CachedLoader):
 
         template_path = str(template.name)
 
-        # If the template matches any of the skip patterns, reload it without cache
+        # If the template matches any of the skip patterns, reload it if the file has changed
         if any(template_path.startswith(d) for d in skip_cache_dirs):
-            template = BaseLoader.get_template(self, template_name, skip)
+            template = self.get_modified_template(template_name, template, skip)
 
         return template
@@ -95,6 +95,9 @@ class MatchItemForm(forms.Form):
         # Setup FileManager
         file_manager.setup()
 
+        # Item selection choices, which are typically shared by every row
+        match_choices = {}
+
         # Create fields
         if row_data:
             # Navigate row data
@@ -123,8 +126,11 @@ class MatchItemForm(forms.Form):
 
                     # Create item selection box
                     elif col_guess in file_manager.OPTIONAL_MATCH_HEADERS:
-                        # Get item options
-                        item_options = [(option.id, option) for option in row['match_options_' + col_guess]]
+                        # Get item options (only evaluated once for each set of options)
+                        options = row['match_options_' + col_guess]
+                        if id(options) not in match_choices:
+                            match_choices[id(options)] = [(option.id, str(option)) for option in options]
+                        item_options = match_choices[id(options)]
                         # Get item match
                         item_match = row['match_' + col_guess]
                         # Set field select box
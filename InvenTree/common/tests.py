@@ -602,6 +602,11 @@ class PluginSettingsApiTest(PluginMixin, InvenTreeAPITestCase):
 
         self.get(url, expected_code=200)
 
+        # Paginated request
+        response = self.get(url, data={'limit': 1}, expected_code=200)
+        self.assertIn('count', response.data)
+        self.assertLessEqual(len(response.data['results']), 1)
+
     def test_valid_plugin_slug(self):
         """Test that an valid plugin slug runs through."""
         # Activate plugin
@@ -2027,6 +2027,7 @@ part_api_urls = [
         re_path(r'^pricing/', PartPricingDetail.as_view(), name='api-part-pricing'),
 
         # BOM download
+        re_path(r'^bom-download/(?P<export_id>[0-9a-f]+)/?', views.BomDownloadResult.as_view(), name='api-bom-download-result'),
         re_path(r'^bom-download/?', views.BomDownload.as_view(), name='api-bom-download'),
 
         # Old pricing endpoint
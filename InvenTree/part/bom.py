@@ -3,13 +3,15 @@
 Primarily BOM upload tools.
 """
 
+import csv
 from collections import OrderedDict
 
+from django.http import StreamingHttpResponse
 from django.utils.translation import gettext as _
 
 from company.models import ManufacturerPart, SupplierPart
-from InvenTree.helpers import (DownloadFile, GetExportFormats, normalize,
-                               str2bool)
+from InvenTree.helpers import (DownloadFile, GetExportFormats, WrapWithQuotes,
+                               normalize, str2bool)
 
 from .admin import BomItemResource
 from .models import BomItem, BomItemSubstitute, Part
@@ -44,7 +46,67 @@ def MakeBomTemplate(fmt):
 
 
 def ExportBom(part: Part, fmt='csv', cascade: bool = False, max_levels: int = None, **kwargs):
-    """Export a BOM (Bill of Materials) for a given part.
+    """Export a BOM (Bill of Materials) for a given part, as a file download.
+
+    Arguments are passed through to ExportBomDataset()
+
+    Returns:
+        StreamingHttpResponse (for CSV / TSV) or HttpResponse (for other formats): Response that can be passed to the endpoint
+    """
+
+    dataset, fmt = ExportBomDataset(part, fmt=fmt, cascade=cascade, max_levels=max_levels, **kwargs)
+
+    filename = f"{part.full_name}_BOM.{fmt}"
+
+    if fmt in ['csv', 'tsv']:
+        # Delimited formats are streamed row-by-row, rather than exporting the entire file in memory
+        response = StreamingHttpResponse(
+            IterDelimitedDataset(dataset, delimiter='\t' if fmt == 'tsv' else ','),
+            content_type='application/text',
+        )
+
+        response['Content-Disposition'] = f'attachment; filename={WrapWithQuotes(filename)}'
+
+        return response
+
+    return DownloadFile(dataset.export(fmt), filename)
+
+
+def ExportBomData(part: Part, fmt='csv', cascade: bool = False, max_levels: int = None, **kwargs):
+    """Generate BOM (Bill of Materials) export data for a given part.
+
+    Arguments are passed through to ExportBomDataset()
+
+    Returns:
+        tuple: (data, filename) for the exported BOM file
+    """
+
+    dataset, fmt = ExportBomDataset(part, fmt=fmt, cascade=cascade, max_levels=max_levels, **kwargs)
+
+    return dataset.export(fmt), f"{part.full_name}_BOM.{fmt}"
+
+
+class EchoBuffer:
+    """Pseudo-buffer which returns each written value, rather than storing it."""
+
+    def write(self, value):
+        """Return the written value"""
+        return value
+
+
+def IterDelimitedDataset(dataset, delimiter=','):
+    """Yield the rows of a tablib dataset as delimited text, one row at a time."""
+
+    writer = csv.writer(EchoBuffer(), delimiter=delimiter)
+
+    yield writer.writerow(dataset.headers)
+
+    for row in dataset:
+        yield writer.writerow(row)
+
+
+def ExportBomDataset(part: Part, fmt='csv', cascade: bool = False, max_levels: int = None, **kwargs):
+    """Construct a dataset containing BOM (Bill of Materials) export data for a given part.
 
     Args:
         part (Part): Part for which the BOM should be exported
@@ -61,7 +123,7 @@ def ExportBom(part: Part, fmt='csv', cascade: bool = False, max_levels: int = No
         substitute_part_data (bool, optional): Include substitute part numbers in exported BOM. Defaults to False
 
     Returns:
-        StreamingHttpResponse: Response that can be passed to the endpoint
+        tuple: (dataset, fmt) containing the BOM data, and the (validated) file format
     """
 
     parameter_data = str2bool(kwargs.get('parameter_data', False))
@@ -323,8 +385,4 @@ def ExportBom(part: Part, fmt='csv', cascade: bool = False, max_levels: int = No
         # Add supplier columns to dataset
         add_columns_to_dataset(manufacturer_cols, len(bom_items))
 
-    data = dataset.export(fmt)
-
-    filename = f"{part.full_name}_BOM.{fmt}"
-
-    return DownloadFile(data, filename)
+    return dataset, fmt
@@ -174,6 +174,39 @@ def annotate_sales_order_allocations(reference: str = ''):
     )
 
 
+def annotate_substitute_available_stock(reference: str = 'pk'):
+    """Annotate the total 'available' stock quantity for all substitute parts of a BomItem.
+
+    - Constructs a single subquery against the BomItemSubstitute table
+    - Calculates (total stock - build allocations - sales allocations) for each substitute part
+    - Aggregates the result across all substitutes for the BomItem
+
+    Args:
+        reference: The relationship reference to the BomItem primary key from the current model
+    """
+
+    ref = 'part__'
+
+    substitute_query = part.models.BomItemSubstitute.objects.filter(
+        bom_item=OuterRef(reference),
+    ).annotate(
+        available=ExpressionWrapper(
+            annotate_total_stock(reference=ref) - annotate_build_order_allocations(reference=ref) - annotate_sales_order_allocations(reference=ref),
+            output_field=DecimalField(),
+        )
+    )
+
+    return Coalesce(
+        Subquery(
+            substitute_query.annotate(
+                total=Func(F('available'), function='SUM', output_field=DecimalField())
+            ).values('total')
+        ),
+        Decimal(0),
+        output_field=DecimalField(),
+    )
+
+
 def variant_stock_query(reference: str = '', filter: Q = stock.models.StockItem.IN_STOCK_FILTER):
     """Create a queryset to retrieve all stock items for variant parts under the specified part
 
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.20 on 2023-08-14 10:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('part', '0113_auto_20230531_1205'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='part',
+            name='IPN',
+            field=models.CharField(blank=True, db_index=True, help_text='Internal Part Number', max_length=100, null=True, verbose_name='IPN'),
+        ),
+    ]
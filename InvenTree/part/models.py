@@ -12,6 +12,7 @@ from decimal import Decimal, InvalidOperation
 
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.core.validators import MinLengthValidator, MinValueValidator
 from django.db import models, transaction
@@ -288,6 +289,26 @@ class PartCategory(MetadataMixin, InvenTreeTree):
         """Returns True if the specified user subscribes to this category."""
         return user in self.get_subscribers(**kwargs)
 
+    def get_starred_state(self, user):
+        """Return the "starred" state of this PartCategory for the specified user.
+
+        Performs a single query against this category and all of its parent categories.
+
+        Returns:
+            A tuple of (starred_directly, starred) where:
+            - starred_directly: True if the user subscribes to this category
+            - starred: True if the user subscribes to this category or any parent category
+        """
+        if not user or not user.is_authenticated:
+            return False, False
+
+        starred_ids = set(PartCategoryStar.objects.filter(
+            user=user,
+            category__in=self.get_ancestors(include_self=True),
+        ).values_list('category_id', flat=True))
+
+        return self.pk in starred_ids, len(starred_ids) > 0
+
     def set_starred(self, user, status):
         """Set the "subscription" status of this PartCategory against the specified user."""
         if not user:
@@ -326,6 +347,29 @@ def rename_part_image(instance, filename):
     return os.path.join(base, fname)
 
 
+# Cache key for the set of existing part image files
+PART_IMAGE_CACHE_KEY = 'part_image_files'
+
+
+def get_part_image_files():
+    """Return the set of filenames in the 'part_images' media directory.
+
+    The directory listing is cached for a short period,
+    to avoid filesystem access every time an image is looked up.
+    """
+    files = cache.get(PART_IMAGE_CACHE_KEY)
+
+    if files is None:
+        try:
+            files = set(os.listdir(settings.MEDIA_ROOT.joinpath('part_images')))
+        except FileNotFoundError:
+            files = set()
+
+        cache.set(PART_IMAGE_CACHE_KEY, files, timeout=60)
+
+    return files
+
+
 class PartManager(TreeManager):
     """Defines a custom object manager for the Part model.
 
@@ -460,13 +504,7 @@ class Part(InvenTreeBarcodeMixin, InvenTreeNotesMixin, MetadataMixin, MPTTModel)
 
                 # Image has been changed
                 if previous.image is not None and self.image != previous.image:
-
-                    # Are there any (other) parts which reference the image?
-                    n_refs = Part.objects.filter(image=previous.image).exclude(pk=self.pk).count()
-
-                    if n_refs == 0:
-                        logger.info(f"Deleting unused image file '{previous.image}'")
-                        previous.image.delete(save=False)
+                    self.delete_unused_image(previous.image)
             except Part.DoesNotExist:
                 pass
 
@@ -479,6 +517,19 @@ class Part(InvenTreeBarcodeMixin, InvenTreeNotesMixin, MetadataMixin, MPTTModel)
                 'variant_of': _('Invalid choice for parent part'),
             })
 
+    def delete_unused_image(self, image):
+        """Delete the provided image file, if it is not referenced by any other part.
+
+        Arguments:
+            image: The (previous) image file for this part
+        """
+
+        # Are there any (other) parts which reference the image?
+        if not Part.objects.filter(image=image).exclude(pk=self.pk).exists():
+            logger.info(f"Deleting unused image file '{image}'")
+            image.delete(save=False)
+            cache.delete(PART_IMAGE_CACHE_KEY)
+
     def __str__(self):
         """Return a string representation of the Part (for use in the admin interface)"""
         return f"{self.full_name} - {self.description}"
@@ -890,6 +941,7 @@ class Part(InvenTreeBarcodeMixin, InvenTreeNotesMixin, MetadataMixin, MPTTModel)
 
     IPN = models.CharField(
         max_length=100, blank=True, null=True,
+        db_index=True,
         verbose_name=_('IPN'),
         help_text=_('Internal Part Number'),
     )
@@ -2204,7 +2256,7 @@ class Part(InvenTreeBarcodeMixin, InvenTreeNotesMixin, MetadataMixin, MPTTModel)
         """
         params = {}
 
-        for parameter in self.parameters.all():
+        for parameter in self.parameters.all().select_related('template'):
             params[parameter.template.name] = parameter.data
 
         return params
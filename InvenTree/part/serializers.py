@@ -1,5 +1,6 @@
 """DRF data serializers for Part app."""
 
+import copy
 import imghdr
 import io
 import logging
@@ -285,16 +286,35 @@ class PartBriefSerializer(InvenTree.serializers.InvenTreeModelSerializer):
             'barcode_hash',
         ]
 
+    # Cache of constructed (unbound) fields, keyed by serializer class and 'pricing' option
+    _fields_cache = {}
+
     def __init__(self, *args, **kwargs):
         """Custom initialization routine for the PartBrief serializer"""
 
-        pricing = kwargs.pop('pricing', True)
+        self.pricing = kwargs.pop('pricing', True)
 
         super().__init__(*args, **kwargs)
 
-        if not pricing:
-            self.fields.pop('pricing_min')
-            self.fields.pop('pricing_max')
+    def get_fields(self):
+        """Return a copy of the cached field set for this serializer.
+
+        Model introspection is only performed once per serializer class,
+        which is significant when this serializer is nested within list endpoints.
+        """
+
+        key = (self.__class__, self.pricing)
+
+        if key not in self._fields_cache:
+            fields = super().get_fields()
+
+            if not self.pricing:
+                fields.pop('pricing_min')
+                fields.pop('pricing_max')
+
+            self._fields_cache[key] = fields
+
+        return copy.deepcopy(self._fields_cache[key])
 
     thumbnail = serializers.CharField(source='get_thumbnail_url', read_only=True)
 
@@ -970,6 +990,10 @@ class PartStocktakeReportGenerateSerializer(serializers.Serializer):
         data = self.validated_data
         user = self.context['request'].user
 
+        # Nothing to do, no need to wake the background worker
+        if not data.get('generate_report', True) and not data.get('update_parts', True):
+            return
+
         # Generate a new report
         offload_task(
             part.stocktake.generate_stocktake_report,
@@ -1192,8 +1216,8 @@ class BomItemSerializer(InvenTree.serializers.InvenTreeModelSerializer):
     on_order = serializers.FloatField(read_only=True)
 
     # Cached pricing fields
-    pricing_min = InvenTree.serializers.InvenTreeMoneySerializer(source='sub_part.pricing.overall_min', allow_null=True, read_only=True)
-    pricing_max = InvenTree.serializers.InvenTreeMoneySerializer(source='sub_part.pricing.overall_max', allow_null=True, read_only=True)
+    pricing_min = InvenTree.serializers.InvenTreeMoneySerializer(source='sub_part.pricing_data.overall_min', allow_null=True, read_only=True)
+    pricing_max = InvenTree.serializers.InvenTreeMoneySerializer(source='sub_part.pricing_data.overall_max', allow_null=True, read_only=True)
 
     # Annotated fields for available stock
     available_stock = serializers.FloatField(read_only=True)
@@ -1203,11 +1227,21 @@ class BomItemSerializer(InvenTree.serializers.InvenTreeModelSerializer):
     @staticmethod
     def setup_eager_loading(queryset):
         """Prefetch against the provided queryset to speed up database access"""
-        queryset = queryset.prefetch_related('part')
+
+        # Only load the Part fields which are required for the 'brief' part serializer
+        part_queryset = Part.objects.only(
+            'pk', 'name', 'IPN', 'revision', 'description', 'image',
+            'active', 'assembly', 'component', 'is_template', 'purchaseable',
+            'salable', 'trackable', 'virtual', 'units', 'barcode_hash',
+            'category', 'default_location', 'variant_of',
+            'tree_id', 'level', 'lft', 'rght',
+        ).prefetch_related(None).select_related('pricing_data')
+
+        queryset = queryset.prefetch_related(models.Prefetch('part', queryset=part_queryset))
         queryset = queryset.prefetch_related('part__category')
         queryset = queryset.prefetch_related('part__stock_items')
 
-        queryset = queryset.prefetch_related('sub_part')
+        queryset = queryset.prefetch_related(models.Prefetch('sub_part', queryset=part_queryset))
         queryset = queryset.prefetch_related('sub_part__category')
 
         queryset = queryset.prefetch_related(
@@ -1218,6 +1252,7 @@ class BomItemSerializer(InvenTree.serializers.InvenTreeModelSerializer):
 
         queryset = queryset.prefetch_related(
             'substitutes',
+            models.Prefetch('substitutes__part', queryset=part_queryset),
             'substitutes__part__stock_items',
         )
 
@@ -1259,21 +1294,10 @@ class BomItemSerializer(InvenTree.serializers.InvenTreeModelSerializer):
             )
         )
 
-        ref = 'substitutes__part__'
-
-        # Extract similar information for any 'substitute' parts
-        queryset = queryset.alias(
-            substitute_stock=part.filters.annotate_total_stock(reference=ref),
-            substitute_build_allocations=part.filters.annotate_build_order_allocations(reference=ref),
-            substitute_sales_allocations=part.filters.annotate_sales_order_allocations(reference=ref)
-        )
-
         # Calculate 'available_substitute_stock' field
+        # All substitute parts are aggregated within a single subquery
         queryset = queryset.annotate(
-            available_substitute_stock=ExpressionWrapper(
-                F('substitute_stock') - F('substitute_build_allocations') - F('substitute_sales_allocations'),
-                output_field=models.DecimalField(),
-            )
+            available_substitute_stock=part.filters.annotate_substitute_available_stock(),
         )
 
         # Annotate the queryset with 'available variant stock' information
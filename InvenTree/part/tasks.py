@@ -1,18 +1,24 @@
 """Background task definitions for the 'part' app"""
 
 
+import json
 import logging
 import random
 import time
+import uuid
 from datetime import datetime, timedelta
 
 from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 import common.models
 import common.notifications
 import common.settings
 import company.models
+import InvenTree.exceptions
 import InvenTree.helpers
 import InvenTree.helpers_model
 import InvenTree.tasks
@@ -234,3 +240,121 @@ def rebuild_supplier_parts(part_id):
 
     if n > 0:
         logger.info(f"Rebuilt {n} supplier parts for part '{prt.name}'")
+
+
+# Directory (within the media storage) where background BOM exports are stored
+BOM_EXPORT_DIR = 'bom_exports'
+
+
+def get_bom_export_path(export_id: str, fmt: str):
+    """Return the storage path for a background BOM export file"""
+    return f'{BOM_EXPORT_DIR}/{export_id}.{fmt}'
+
+
+def get_bom_export_info_path(export_id: str):
+    """Return the storage path for the information file of a background BOM export"""
+    return f'{BOM_EXPORT_DIR}/{export_id}.json'
+
+
+def save_bom_export_info(export_id: str, info: dict):
+    """Save (or replace) the information file for a background BOM export"""
+    path = get_bom_export_info_path(export_id)
+
+    if default_storage.exists(path):
+        default_storage.delete(path)
+
+    default_storage.save(path, ContentFile(json.dumps(info).encode('utf-8')))
+
+
+def create_bom_export(part_id: int, fmt: str):
+    """Register a new background BOM export for the given part and file format.
+
+    The export information is saved to the media storage (alongside the generated file),
+    so that it is available to every server process.
+
+    Returns:
+        str: Unique identifier for the new export
+    """
+    export_id = uuid.uuid4().hex
+
+    info = {
+        'part': part_id,
+        'format': fmt,
+    }
+
+    save_bom_export_info(export_id, info)
+
+    return export_id
+
+
+def get_bom_export_info(export_id: str):
+    """Return the information for a background BOM export, or None if the export does not exist"""
+    path = get_bom_export_info_path(export_id)
+
+    if not default_storage.exists(path):
+        return None
+
+    try:
+        with default_storage.open(path, 'rb') as info_file:
+            return json.load(info_file)
+    except (OSError, ValueError):
+        logger.warning(f"get_bom_export_info: Could not read information for export '{export_id}'")
+        return None
+
+
+def export_bom(part_id: int, export_id: str, fmt: str = 'csv', **kwargs):
+    """Generate a BOM export file in the background.
+
+    The generated file is saved to the media storage,
+    where it can be retrieved via the BOM download endpoint.
+
+    Arguments:
+        part_id: ID of the Part for which the BOM is exported
+        export_id: Unique identifier for this export
+        fmt: File format for the exported BOM
+
+    Any extra keyword arguments are passed through to part.bom.ExportBomData()
+    """
+
+    from part.bom import ExportBomData
+
+    try:
+        prt = part.models.Part.objects.get(pk=part_id)
+    except part.models.Part.DoesNotExist:
+        logger.warning(f"export_bom: Part with ID {part_id} does not exist")
+        return
+
+    try:
+        data, _filename = ExportBomData(prt, fmt=fmt, **kwargs)
+
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+
+        default_storage.save(get_bom_export_path(export_id, fmt), ContentFile(data))
+    except Exception:
+        InvenTree.exceptions.log_error('part.tasks.export_bom')
+
+        # Record the failure, so that the export is no longer reported as pending
+        info = get_bom_export_info(export_id) or {'part': part_id, 'format': fmt}
+        info['failed'] = True
+
+        save_bom_export_info(export_id, info)
+
+
+@scheduled_task(ScheduledTask.DAILY)
+def delete_old_bom_exports():
+    """Delete background BOM export files which are more than a day old"""
+
+    if not default_storage.exists(BOM_EXPORT_DIR):
+        return
+
+    # Note: timezone.now() matches the (aware or naive) modification times returned by the storage backend
+    threshold = timezone.now() - timedelta(days=1)
+
+    _dirs, files = default_storage.listdir(BOM_EXPORT_DIR)
+
+    for filename in files:
+        path = f'{BOM_EXPORT_DIR}/{filename}'
+
+        if default_storage.get_modified_time(path) < threshold:
+            default_storage.delete(path)
@@ -1,10 +1,18 @@
 """Unit testing for BOM export functionality."""
 
 import csv
+import os
+import time
+from unittest import mock
 
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
 from django.urls import reverse
 
 from InvenTree.unit_test import InvenTreeTestCase
+from part.tasks import (create_bom_export, delete_old_bom_exports, export_bom,
+                        get_bom_export_info, get_bom_export_info_path,
+                        get_bom_export_path)
 
 
 class BomExportTest(InvenTreeTestCase):
@@ -185,3 +193,92 @@ class BomExportTest(InvenTreeTestCase):
 
         content = response.headers['Content-Disposition']
         self.assertEqual(content, 'attachment; filename="BOB | Bob | A2_BOM.json"')
+
+    def remove_bom_export(self, export_id, fmt='csv'):
+        """Remove any files generated for a background BOM export"""
+        for path in [get_bom_export_path(export_id, fmt), get_bom_export_info_path(export_id)]:
+            if default_storage.exists(path):
+                default_storage.delete(path)
+
+    def test_export_background(self):
+        """Test BOM export which is generated in the background."""
+        params = {
+            'format': 'csv',
+            'cascade': True,
+            'background': True,
+        }
+
+        response = self.client.get(self.url, data=params)
+
+        self.assertEqual(response.status_code, 200)
+
+        data = response.json()
+        self.assertIn('export_id', data)
+
+        self.addCleanup(self.remove_bom_export, data['export_id'])
+
+        # An unknown export ID is not found
+        url = reverse('api-bom-download-result', kwargs={'pk': 100, 'export_id': 'abcdef'})
+        response = self.client.get(url, data={'format': 'csv'})
+        self.assertEqual(response.status_code, 404)
+
+        # The export ID must match the part
+        url = reverse('api-bom-download-result', kwargs={'pk': 1, 'export_id': data['export_id']})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
+
+        # The export ID must match the format (if specified)
+        url = reverse('api-bom-download-result', kwargs={'pk': 100, 'export_id': data['export_id']})
+        response = self.client.get(url, data={'format': 'xls'})
+        self.assertEqual(response.status_code, 404)
+
+        # An export which has not yet been generated is pending
+        pending_id = create_bom_export(100, 'csv')
+        self.addCleanup(self.remove_bom_export, pending_id)
+
+        url = reverse('api-bom-download-result', kwargs={'pk': 100, 'export_id': pending_id})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 202)
+
+        # Background worker is not running, so the export has already been generated
+        response = self.client.get(data['url'])
+        self.assertEqual(response.status_code, 200)
+
+        content = response.headers['Content-Disposition']
+        self.assertEqual(content, 'attachment; filename="BOB | Bob | A2_BOM.csv"')
+
+        content = b''.join(response.streaming_content).decode()
+        self.assertIn('BOM Level', content)
+
+    def test_export_background_failed(self):
+        """Test that a background BOM export which fails is reported as such."""
+        export_id = create_bom_export(100, 'csv')
+        self.addCleanup(self.remove_bom_export, export_id)
+
+        with mock.patch('part.bom.ExportBomData', side_effect=ValueError('BOM export error')):
+            export_bom(100, export_id, 'csv')
+
+        self.assertTrue(get_bom_export_info(export_id)['failed'])
+
+        url = reverse('api-bom-download-result', kwargs={'pk': 100, 'export_id': export_id})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 500)
+        self.assertIn('BOM export failed', str(response.content))
+
+    def test_delete_old_exports(self):
+        """Test that old background BOM exports are removed by the scheduled task."""
+        old_path = default_storage.save(get_bom_export_path('0' * 32, 'csv'), ContentFile(b'old'))
+        new_path = default_storage.save(get_bom_export_path('1' * 32, 'csv'), ContentFile(b'new'))
+
+        # Mark the 'old' export file as being two days old
+        timestamp = time.time() - 2 * 24 * 60 * 60
+        os.utime(default_storage.path(old_path), (timestamp, timestamp))
+
+        # Timezone support is enabled in production (storage returns aware datetimes)
+        with self.settings(USE_TZ=True):
+            delete_old_bom_exports()
+
+        self.assertFalse(default_storage.exists(old_path))
+        self.assertTrue(default_storage.exists(new_path))
+
+        default_storage.delete(new_path)
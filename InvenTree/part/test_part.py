@@ -620,6 +620,10 @@ class PartSubscriptionTests(InvenTreeTestCase):
         # Check lower level category
         self.assertTrue(self.category.is_starred_by(self.user))
 
+        # Starred state is available in a single query
+        self.assertEqual(cat.get_starred_state(self.user), (True, True))
+        self.assertEqual(self.category.get_starred_state(self.user), (False, True))
+
         # Check part
         self.assertTrue(self.part.is_starred_by(self.user))
 
@@ -1,8 +1,11 @@
 """Unit tests for Part Views (see views.py)"""
 
+from django.contrib.messages import get_messages
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 
 from InvenTree.unit_test import InvenTreeTestCase
+from stock.models import StockItem
 
 from .models import Part
 
@@ -113,3 +116,110 @@ class PartDetailTest(PartViewTestCase):
         response = self.client.get(reverse('api-bom-download', args=(1,)), HTTP_X_REQUESTED_WITH='XMLHttpRequest')
         self.assertEqual(response.status_code, 200)
         self.assertIn('streaming_content', dir(response))
+
+
+class PartImportTest(PartViewTestCase):
+    """Unit tests for creating parts via the PartImport view"""
+
+    def import_parts(self, headers, rows):
+        """Upload the provided data to the part import form wizard, and step through each form.
+
+        Each column is matched to the field of the same name, and the cell values are submitted unchanged.
+
+        Returns:
+            list: Messages generated by the import
+        """
+        url = reverse('part-import')
+
+        # Management form prefix for the PartImport wizard
+        step = 'part_import-current_step'
+
+        # Upload the file
+        content = '\n'.join(','.join(row) for row in [headers, *rows])
+
+        response = self.client.post(url, {
+            step: 'upload',
+            'upload-file': SimpleUploadedFile('parts.csv', content.encode(), content_type='text/csv'),
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['wizard']['steps'].current, 'fields')
+
+        # Match fields (the column and row data are passed back to the wizard, as per the template)
+        data = {step: 'fields'}
+
+        for col, header in enumerate(headers):
+            data[f'col_name_{col}'] = header
+            data[f'fields-{header}'] = header
+
+            for idx, row in enumerate(rows):
+                data[f'row_{idx}_col_{col}'] = row[col]
+
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['wizard']['steps'].current, 'items')
+
+        # Match items
+        data = {step: 'items'}
+
+        for idx, row in enumerate(rows):
+            for header, value in zip(headers, row):
+                data[f'items-{header.lower()}-{idx}'] = value
+
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 302)
+
+        return [str(msg) for msg in get_messages(response.wsgi_request)]
+
+    def test_import(self):
+        """Test that imported parts (and stock) are created"""
+        n_parts = Part.objects.count()
+        n_stock = StockItem.objects.count()
+
+        msgs = self.import_parts(
+            ['Name', 'Description', 'Category', 'IPN', 'default_location', 'Stock'],
+            [
+                ['Imported part A', 'Description of imported part A', '1', 'IMP-A', '', '10'],
+                ['Imported part B', 'Description of imported part B', '1', '', '1', ''],
+            ]
+        )
+
+        self.assertEqual(len(msgs), 1)
+        self.assertIn('Imported 2 parts', msgs[0])
+
+        self.assertEqual(Part.objects.count(), n_parts + 2)
+        self.assertEqual(StockItem.objects.count(), n_stock + 1)
+
+        for name in ['Imported part A', 'Imported part B']:
+            prt = Part.objects.get(name=name)
+
+            # Each imported part is the root of its own (valid) tree
+            self.assertTrue(prt.is_root_node())
+            self.assertEqual(Part.objects.filter(tree_id=prt.tree_id).count(), 1)
+            self.assertEqual(prt.category.pk, 1)
+
+        prt = Part.objects.get(IPN='IMP-A')
+        self.assertEqual(prt.total_stock, 10)
+
+    def test_import_errors(self):
+        """Test that invalid rows are reported, without preventing other rows from being imported"""
+        n_parts = Part.objects.count()
+
+        msgs = self.import_parts(
+            ['Name', 'Description', 'Category', 'IPN'],
+            [
+                ['Imported part C', 'Description of imported part C', '1', 'IMP-C'],
+                # Duplicate of the previous row
+                ['Imported part C', 'Description of imported part C', '1', 'IMP-C'],
+                # No category provided
+                ['Imported part D', 'Description of imported part D', '', 'IMP-D'],
+            ]
+        )
+
+        self.assertEqual(len(msgs), 2)
+        self.assertIn('Imported 1 parts', msgs[0])
+        self.assertIn('Some errors occurred', msgs[1])
+        self.assertIn('no category assigned', msgs[1])
+
+        self.assertEqual(Part.objects.count(), n_parts + 1)
+        self.assertEqual(Part.objects.filter(name='Imported part C').count(), 1)
+        self.assertFalse(Part.objects.filter(name='Imported part D').exists())
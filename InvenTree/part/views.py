@@ -1,11 +1,16 @@
 """Django views for interacting with Part app."""
 
 import os
+from collections import Counter
 from decimal import Decimal
 
 from django.conf import settings
 from django.contrib import messages
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.http import FileResponse, Http404, JsonResponse
 from django.shortcuts import HttpResponseRedirect, get_object_or_404
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
@@ -16,14 +21,16 @@ from common.models import InvenTreeSetting
 from common.views import FileManagementAjaxView, FileManagementFormView
 from company.models import SupplierPart
 from InvenTree.helpers import str2bool, str2int
+from InvenTree.tasks import offload_task
 from InvenTree.views import AjaxUpdateView, AjaxView, InvenTreeRoleMixin
 from plugin.views import InvenTreePluginViewMixin
 from stock.models import StockItem, StockLocation
 
 from . import forms as part_forms
 from . import settings as part_settings
+from . import tasks as part_tasks
 from .bom import ExportBom, IsValidBOMFormat, MakeBomTemplate
-from .models import Part, PartCategory
+from .models import Part, PartCategory, get_part_image_files
 from .part import MakePartTemplate
 
 
@@ -34,9 +41,17 @@ class PartIndex(InvenTreeRoleMixin, InvenTreePluginViewMixin, ListView):
     template_name = 'part/category.html'
     context_object_name = 'parts'
 
+    PART_COUNT_CACHE_KEY = 'part_index_part_count'
+
     def get_queryset(self):
-        """Custom queryset lookup to prefetch related fields"""
-        return Part.objects.all().select_related('category')
+        """Custom queryset lookup to prefetch related fields.
+
+        Only the fields required for displaying the part list are loaded.
+        """
+        return Part.objects.all().select_related('category').only(
+            'pk', 'name', 'IPN', 'revision', 'description', 'active', 'image',
+            'category', 'category__name', 'category__pathstring',
+        )
 
     def get_context_data(self, **kwargs):
         """Returns custom context data for the PartIndex view:
@@ -48,11 +63,19 @@ class PartIndex(InvenTreeRoleMixin, InvenTreePluginViewMixin, ListView):
         context = super().get_context_data(**kwargs).copy()
 
         # View top-level categories
-        children = PartCategory.objects.filter(parent=None)
+        children = PartCategory.objects.filter(parent=None).only('pk', 'name', 'pathstring', 'parent')
 
         context['children'] = children
         context['category_count'] = PartCategory.objects.count()
-        context['part_count'] = Part.objects.count()
+
+        # The total part count may be a few seconds out of date, so it is cached
+        part_count = cache.get(self.PART_COUNT_CACHE_KEY)
+
+        if part_count is None:
+            part_count = Part.objects.count()
+            cache.set(self.PART_COUNT_CACHE_KEY, part_count, timeout=30)
+
+        context['part_count'] = part_count
 
         return context
 
@@ -155,33 +178,68 @@ class PartImport(FileManagementFormView):
         self.allowed_items['variant_of'] = Part.objects.all().exclude(is_template=False)
         self.matches['variant_of'] = ['name__icontains']
 
+        # Model fields to match against, for each column
+        self.match_fields = {
+            idx: [match.split('__')[0] for match in matches] for idx, matches in self.matches.items()
+        }
+
+        # Cache of matched items, for each column and cell value
+        self.match_cache = {}
+
         # setup
         self.file_manager.setup()
+
+        match_headers = set(self.file_manager.OPTIONAL_MATCH_HEADERS)
+
         # collect submitted column indexes
-        col_ids = {}
+        # (split into columns which are matched against items, and general fields)
+        match_cols = {}
+        field_cols = {}
         for col in self.file_manager.HEADERS:
             index = self.get_column_index(col)
             if index >= 0:
-                col_ids[col] = index
+                if col in match_headers:
+                    match_cols[col] = index
+                else:
+                    field_cols[col.lower()] = index
+
+        # Evaluate the available options for each match column once, to be shared by all rows
+        match_options = {idx: list(self.allowed_items[idx]) for idx in match_cols}
 
         # parse all rows
         for row in self.rows:
             # check each submitted column
-            for idx in col_ids:
-                data = row['data'][col_ids[idx]]['cell']
+            for idx, col_id in match_cols.items():
+                data = row['data'][col_id]['cell']
 
-                if idx in self.file_manager.OPTIONAL_MATCH_HEADERS:
-                    try:
-                        exact_match = self.allowed_items[idx].get(**{a: data for a in self.matches[idx]})
-                    except (ValueError, self.allowed_items[idx].model.DoesNotExist, self.allowed_items[idx].model.MultipleObjectsReturned):
-                        exact_match = None
+                row['match_options_' + idx] = match_options[idx]
+                row['match_' + idx] = self.get_exact_match(idx, data)
 
-                    row['match_options_' + idx] = self.allowed_items[idx]
-                    row['match_' + idx] = exact_match
-                    continue
+            # general fields
+            for field, col_id in field_cols.items():
+                row[field] = row['data'][col_id]['cell']
+
+    def get_exact_match(self, idx, data):
+        """Return the single allowed item which matches the provided cell data (or None).
+
+        Items are matched with a case insensitive 'contains' comparison against the fields in self.matches.
+        Matching is performed in memory, as the allowed items are only fetched once per column.
+        """
+        key = (idx, data)
+
+        if key not in self.match_cache:
+            value = str(data).lower()
+            fields = self.match_fields[idx]
 
-                # general fields
-                row[idx.lower()] = data
+            items = [
+                item for item in self.allowed_items[idx] if all(
+                    getattr(item, field) is not None and value in str(getattr(item, field)).lower() for field in fields
+                )
+            ]
+
+            self.match_cache[key] = items[0] if len(items) == 1 else None
+
+        return self.match_cache[key]
 
     def done(self, form_list, **kwargs):
         """Create items."""
@@ -190,76 +248,117 @@ class PartImport(FileManagementFormView):
         import_done = 0
         import_error = []
 
-        # Create Part instances
-        for part_data in items.values():
+        # Default values for boolean part fields (evaluated once for the entire import)
+        bool_defaults = {
+            'active': True,
+            'assembly': str2bool(part_settings.part_assembly_default()),
+            'component': str2bool(part_settings.part_component_default()),
+            'is_template': str2bool(part_settings.part_template_default()),
+            'purchaseable': str2bool(part_settings.part_purchaseable_default()),
+            'salable': str2bool(part_settings.part_salable_default()),
+            'trackable': str2bool(part_settings.part_trackable_default()),
+            'virtual': str2bool(part_settings.part_virtual_default()),
+        }
+
+        # Default values for integer part fields
+        int_defaults = {
+            'default_expiry': 0,
+            'minimum_stock': 0,
+            'base_cost': 0,
+            'multiple': 1,
+        }
+
+        # Fetch the referenced items for each match column with a single query
+        match_items = {}
+
+        for idx in self.file_manager.OPTIONAL_MATCH_HEADERS:
+            pks = set()
+
+            for part_data in items.values():
+                try:
+                    pks.add(int(part_data[idx.lower()]))
+                except (KeyError, ValueError):
+                    continue
 
-            # set related parts
-            optional_matches = {}
-            for idx in self.file_manager.OPTIONAL_MATCH_HEADERS:
-                if idx.lower() in part_data:
-                    try:
-                        optional_matches[idx] = self.allowed_items[idx].get(pk=int(part_data[idx.lower()]))
-                    except (ValueError, self.allowed_items[idx].model.DoesNotExist, self.allowed_items[idx].model.MultipleObjectsReturned):
+            match_items[idx] = self.allowed_items[idx].in_bulk(pks)
+
+        # All parts are created within a single transaction
+        with transaction.atomic():
+            # Create Part instances
+            for part_data in items.values():
+
+                # set related parts
+                optional_matches = {}
+                for idx in self.file_manager.OPTIONAL_MATCH_HEADERS:
+                    if idx.lower() in part_data:
+                        try:
+                            optional_matches[idx] = match_items[idx].get(int(part_data[idx.lower()]), None)
+                        except ValueError:
+                            optional_matches[idx] = None
+                    else:
                         optional_matches[idx] = None
-                else:
-                    optional_matches[idx] = None
-
-            # add part
-            new_part = Part(
-                name=part_data.get('name', ''),
-                description=part_data.get('description', ''),
-                keywords=part_data.get('keywords', None),
-                IPN=part_data.get('ipn', None),
-                revision=part_data.get('revision', None),
-                link=part_data.get('link', None),
-                default_expiry=str2int(part_data.get('default_expiry'), 0),
-                minimum_stock=str2int(part_data.get('minimum_stock'), 0),
-                units=part_data.get('units', None),
-                notes=part_data.get('notes', None),
-                category=optional_matches['Category'],
-                default_location=optional_matches['default_location'],
-                default_supplier=optional_matches['default_supplier'],
-                variant_of=optional_matches['variant_of'],
-                active=str2bool(part_data.get('active', True)),
-                base_cost=str2int(part_data.get('base_cost'), 0),
-                multiple=str2int(part_data.get('multiple'), 1),
-                assembly=str2bool(part_data.get('assembly', part_settings.part_assembly_default())),
-                component=str2bool(part_data.get('component', part_settings.part_component_default())),
-                is_template=str2bool(part_data.get('is_template', part_settings.part_template_default())),
-                purchaseable=str2bool(part_data.get('purchaseable', part_settings.part_purchaseable_default())),
-                salable=str2bool(part_data.get('salable', part_settings.part_salable_default())),
-                trackable=str2bool(part_data.get('trackable', part_settings.part_trackable_default())),
-                virtual=str2bool(part_data.get('virtual', part_settings.part_virtual_default())),
-                image=part_data.get('image', None),
-            )
 
-            # check if there's a category assigned, if not skip this part or else bad things happen
-            if not optional_matches['Category']:
-                import_error.append(_("Can't import part {name} because there is no category assigned").format(name=new_part.name))
-                continue
+                # Values are only converted for columns which are present in the imported data
+                field_values = {
+                    field: str2bool(part_data[field]) if field in part_data else default
+                    for field, default in bool_defaults.items()
+                }
+
+                field_values.update({
+                    field: str2int(part_data[field], default) if field in part_data else default
+                    for field, default in int_defaults.items()
+                })
+
+                # add part
+                new_part = Part(
+                    name=part_data.get('name', ''),
+                    description=part_data.get('description', ''),
+                    keywords=part_data.get('keywords', None),
+                    IPN=part_data.get('ipn', None),
+                    revision=part_data.get('revision', None),
+                    link=part_data.get('link', None),
+                    units=part_data.get('units', None),
+                    notes=part_data.get('notes', None),
+                    category=optional_matches['Category'],
+                    default_location=optional_matches['default_location'],
+                    default_supplier=optional_matches['default_supplier'],
+                    variant_of=optional_matches['variant_of'],
+                    image=part_data.get('image', None),
+                    **field_values,
+                )
+
+                # check if there's a category assigned, if not skip this part or else bad things happen
+                if not optional_matches['Category']:
+                    import_error.append(_("Can't import part {name} because there is no category assigned").format(name=new_part.name))
+                    continue
 
-            try:
-                new_part.save()
+                try:
+                    # Each row is saved within a savepoint, so a failed row is rolled back
+                    with transaction.atomic():
+                        new_part.save()
+
+                        # add stock item if set
+                        if part_data.get('stock', None):
+                            stock = StockItem(
+                                part=new_part,
+                                location=new_part.default_location,
+                                quantity=int(part_data.get('stock', 1)),
+                            )
+                            stock.save()
 
-                # add stock item if set
-                if part_data.get('stock', None):
-                    stock = StockItem(
-                        part=new_part,
-                        location=new_part.default_location,
-                        quantity=int(part_data.get('stock', 1)),
-                    )
-                    stock.save()
+                    import_done += 1
+                except ValidationError as _e:
+                    import_error.append(', '.join(set(_e.messages)))
 
-                import_done += 1
-            except ValidationError as _e:
-                import_error.append(', '.join(set(_e.messages)))
+        # Ensure that the part index displays the updated part count
+        cache.delete(PartIndex.PART_COUNT_CACHE_KEY)
 
         # Set alerts
         if import_done:
             alert = f"<strong>{_('Part-Import')}</strong><br>{_('Imported {n} parts').format(n=import_done)}"
             messages.success(self.request, alert)
         if import_error:
-            error_text = '\n'.join([f'<li><strong>{import_error.count(a)}</strong>: {a}</li>' for a in set(import_error)])
+            error_text = '\n'.join([f'<li><strong>{count}</strong>: {a}</li>' for a, count in Counter(import_error).items()])
             messages.error(self.request, f"<strong>{_('Some errors occurred:')}</strong><br><ul>{error_text}</ul>")
 
         return HttpResponseRedirect(reverse('part-index'))
@@ -295,7 +394,8 @@ class PartDetail(InvenTreeRoleMixin, InvenTreePluginViewMixin, DetailView):
     """Detail view for Part object."""
 
     context_object_name = 'part'
-    queryset = Part.objects.all().select_related('category')
+    # Part notes are loaded separately via the API
+    queryset = Part.objects.all().select_related('category').defer('notes')
     template_name = 'part/detail.html'
     form_class = part_forms.PartPriceForm
 
@@ -312,9 +412,19 @@ class PartDetail(InvenTreeRoleMixin, InvenTreePluginViewMixin, DetailView):
 
         return context
 
+    def get_object(self, queryset=None):
+        """Return the Part instance for this view.
+
+        The result is cached against the view, as it is requested multiple times per request.
+        """
+        if getattr(self, '_cached_object', None) is None:
+            self._cached_object = super().get_object(queryset=queryset)
+
+        return self._cached_object
+
     def get_quantity(self):
         """Return set quantity in decimal format."""
-        return Decimal(self.request.POST.get('quantity', 1))
+        return Decimal(self.request.POST.get('quantity', '') or '1')
 
     def get_part(self):
         """Return the Part instance associated with this view"""
@@ -338,8 +448,11 @@ class PartDetailFromIPN(PartDetail):
     slug_field = 'IPN'
     slug_url_kwarg = 'slug'
 
-    def get_object(self):
+    def get_object(self, queryset=None):
         """Return Part object which IPN field matches the slug value."""
+        if getattr(self, '_cached_object', None) is not None:
+            return self._cached_object
+
         queryset = self.get_queryset()
         # Get slug
         slug = self.kwargs.get(self.slug_url_kwarg)
@@ -347,17 +460,13 @@ class PartDetailFromIPN(PartDetail):
         if slug is not None:
             slug_field = self.get_slug_field()
             # Filter by the slug value
-            queryset = queryset.filter(**{slug_field: slug})
+            # Only two results are needed to determine if the match is unique
+            parts = list(queryset.filter(**{slug_field: slug})[:2])
 
-            try:
-                # Get unique part from queryset
-                part = queryset.get()
-                # Return Part object
-                return part
-            except queryset.model.MultipleObjectsReturned:
-                pass
-            except queryset.model.DoesNotExist:
-                pass
+            if len(parts) == 1:
+                # Return unique Part object
+                self._cached_object = parts[0]
+                return self._cached_object
 
         return None
 
@@ -397,10 +506,17 @@ class PartImageSelect(AjaxUpdateView):
             img_path = settings.MEDIA_ROOT.joinpath('part_images', img)
 
             # Ensure that the image already exists
-            if os.path.exists(img_path):
+            # (recently uploaded images may not yet be in the cached directory listing)
+            if img in get_part_image_files() or os.path.exists(img_path):
+
+                previous_image = part.image
+                image = os.path.join('part_images', img)
 
-                part.image = os.path.join('part_images', img)
-                part.save()
+                # Only the image field changes, so update the single column directly
+                Part.objects.filter(pk=part.pk).update(image=image)
+
+                if previous_image and previous_image != image:
+                    part.delete_unused_image(previous_image)
 
                 data['success'] = _('Updated part image')
 
@@ -476,17 +592,35 @@ class BomDownload(AjaxView):
         if not IsValidBOMFormat(export_format):
             export_format = 'csv'
 
-        return ExportBom(part,
-                         fmt=export_format,
-                         cascade=cascade,
-                         max_levels=levels,
-                         parameter_data=parameter_data,
-                         stock_data=stock_data,
-                         supplier_data=supplier_data,
-                         manufacturer_data=manufacturer_data,
-                         pricing_data=pricing_data,
-                         substitute_part_data=substitute_part_data,
-                         )
+        export_options = {
+            'cascade': cascade,
+            'max_levels': levels,
+            'parameter_data': parameter_data,
+            'stock_data': stock_data,
+            'supplier_data': supplier_data,
+            'manufacturer_data': manufacturer_data,
+            'pricing_data': pricing_data,
+            'substitute_part_data': substitute_part_data,
+        }
+
+        if str2bool(request.GET.get('background', False)):
+            # Generate the BOM file in the background, and return a handle to the export
+            export_id = part_tasks.create_bom_export(part.pk, export_format)
+
+            offload_task(
+                part_tasks.export_bom,
+                part.pk,
+                export_id,
+                fmt=export_format,
+                **export_options
+            )
+
+            return JsonResponse({
+                'export_id': export_id,
+                'url': reverse('api-bom-download-result', kwargs={'pk': part.pk, 'export_id': export_id}) + f'?format={export_format}',
+            })
+
+        return ExportBom(part, fmt=export_format, **export_options)
 
     def get_data(self):
         """Return a custom message"""
@@ -495,6 +629,52 @@ class BomDownload(AjaxView):
         }
 
 
+class BomDownloadResult(AjaxView):
+    """Download the result of a BOM export which was generated in the background.
+
+    - Returns the BOM file if the export is complete
+    - Returns a 202 (accepted) response if the export is not yet available
+    - Returns a 500 response if the export failed
+    - Returns a 404 response if the export does not exist, or does not match the part (or format)
+    """
+
+    role_required = 'part.view'
+
+    model = Part
+
+    def get(self, request, *args, **kwargs):
+        """Perform GET request to download the generated BOM file"""
+        part = get_object_or_404(Part, pk=self.kwargs['pk'])
+
+        export_id = self.kwargs['export_id']
+
+        # The export must have been created for this part
+        info = part_tasks.get_bom_export_info(export_id)
+
+        if info is None or info.get('part') != part.pk:
+            raise Http404(_('BOM export not found'))
+
+        export_format = info.get('format')
+
+        # If a format is specified, it must match the format of the export
+        if request.GET.get('format', export_format) != export_format or not IsValidBOMFormat(export_format):
+            raise Http404(_('BOM export not found'))
+
+        if info.get('failed', False):
+            return JsonResponse({'complete': False, 'error': _('BOM export failed')}, status=500)
+
+        path = part_tasks.get_bom_export_path(export_id, export_format)
+
+        if not default_storage.exists(path):
+            return JsonResponse({'complete': False}, status=202)
+
+        return FileResponse(
+            default_storage.open(path, 'rb'),
+            as_attachment=True,
+            filename=f"{part.full_name}_BOM.{export_format}",
+        )
+
+
 class PartPricing(AjaxView):
     """View for inspecting part pricing information."""
 
@@ -507,7 +687,7 @@ class PartPricing(AjaxView):
 
     def get_quantity(self):
         """Return set quantity in decimal format."""
-        return Decimal(self.request.POST.get('quantity', 1))
+        return Decimal(self.request.POST.get('quantity', '') or '1')
 
     def get_part(self):
         """Return the Part instance associated with this view"""
@@ -524,9 +704,6 @@ class PartPricing(AjaxView):
         # TODO - Capacity for price comparison in different currencies
         currency = None
 
-        # Currency scaler
-        scaler = Decimal(1.0)
-
         part = self.get_part()
 
         ctx = {
@@ -539,15 +716,12 @@ class PartPricing(AjaxView):
             return ctx
 
         # Supplier pricing information
-        if part.supplier_count > 0:
+        if part.supplier_parts.exists():
             buy_price = part.get_supplier_price_range(quantity)
 
             if buy_price is not None:
                 min_buy_price, max_buy_price = buy_price
 
-                min_buy_price /= scaler
-                max_buy_price /= scaler
-
                 min_unit_buy_price = round(min_buy_price / quantity, 3)
                 max_unit_buy_price = round(max_buy_price / quantity, 3)
 
@@ -563,7 +737,7 @@ class PartPricing(AjaxView):
                     ctx['max_unit_buy_price'] = max_unit_buy_price
 
         # BOM pricing information
-        if part.bom_count > 0:
+        if part.get_bom_items().exists():
 
             use_internal = InvenTreeSetting.get_setting('PART_BOM_USE_INTERNAL_PRICE', False)
             bom_price = part.get_bom_price_range(quantity, internal=use_internal)
@@ -572,9 +746,6 @@ class PartPricing(AjaxView):
             if bom_price is not None:
                 min_bom_price, max_bom_price = bom_price
 
-                min_bom_price /= scaler
-                max_bom_price /= scaler
-
                 if min_bom_price:
                     ctx['min_total_bom_price'] = round(min_bom_price, 3)
                     ctx['min_unit_bom_price'] = round(min_bom_price / quantity, 3)
@@ -586,8 +757,6 @@ class PartPricing(AjaxView):
             if purchase_price is not None:
                 min_bom_purchase_price, max_bom_purchase_price = purchase_price
 
-                min_bom_purchase_price /= scaler
-                max_bom_purchase_price /= scaler
                 if min_bom_purchase_price:
                     ctx['min_total_bom_purchase_price'] = round(min_bom_purchase_price, 3)
                     ctx['min_unit_bom_purchase_price'] = round(min_bom_purchase_price / quantity, 3)
@@ -673,15 +842,6 @@ class CategoryDetail(InvenTreeRoleMixin, InvenTreePluginViewMixin, DetailView):
         if category:
 
             # Insert "starred" information
-            context['starred_directly'] = category.is_starred_by(
-                self.request.user,
-                include_parents=False,
-            )
-
-            if context['starred_directly']:
-                # Save a database lookup - if 'starred_directly' is True, we know 'starred' is also
-                context['starred'] = True
-            else:
-                context['starred'] = category.is_starred_by(self.request.user)
+            context['starred_directly'], context['starred'] = category.get_starred_state(self.request.user)
 
         return context
@@ -2,7 +2,6 @@
 
 from django.urls import include, path, re_path
 
-from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import permissions, status
 from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
@@ -10,10 +9,12 @@ from rest_framework.response import Response
 import plugin.serializers as PluginSerializers
 from common.api import GlobalSettingsPermissions
 from InvenTree.api import MetadataView
-from InvenTree.filters import SEARCH_ORDER_FILTER
+from InvenTree.filters import (SEARCH_ORDER_FILTER_NO_HTML,
+                               InvenTreeNoHTMLFilterBackend)
 from InvenTree.mixins import (CreateAPI, ListAPI, RetrieveUpdateAPI,
                               RetrieveUpdateDestroyAPI, UpdateAPI)
 from InvenTree.permissions import IsSuperuser
+from plugin import registry
 from plugin.base.action.api import ActionPluginView
 from plugin.base.barcodes.api import barcode_api_urls
 from plugin.base.locate.api import LocatePluginView
@@ -33,7 +34,9 @@ class PluginList(ListAPI):
     permission_classes = [permissions.IsAuthenticated]
 
     serializer_class = PluginSerializers.PluginConfigSerializer
-    queryset = PluginConfig.objects.all()
+
+    # Plugin metadata is not required for the list endpoint
+    queryset = PluginConfig.objects.all().only('pk', 'key', 'name', 'active')
 
     def filter_queryset(self, queryset):
         """Filter for API requests.
@@ -48,17 +51,21 @@ class PluginList(ListAPI):
         mixin = params.get('mixin', None)
 
         if mixin:
-            matches = []
+            # Determine the matching plugins from the registry,
+            # rather than constructing the mixin data for every PluginConfig instance
+            matches = [
+                key for key in registry.plugins_full.keys() if mixin in registry.get_plugin_mixins(key)
+            ]
 
-            for result in queryset:
-                if mixin in result.mixins().keys():
-                    matches.append(result.pk)
+            if not matches:
+                # No need to query the database if there are no matching plugins
+                return queryset.none()
 
-            queryset = queryset.filter(pk__in=matches)
+            queryset = queryset.filter(key__in=matches)
 
         return queryset
 
-    filter_backends = SEARCH_ORDER_FILTER
+    filter_backends = SEARCH_ORDER_FILTER_NO_HTML
 
     filterset_fields = [
         'active',
@@ -137,10 +144,17 @@ class PluginActivate(UpdateAPI):
     permission_classes = [IsSuperuser, ]
 
     def get_object(self):
-        """Returns the object for the view."""
-        if self.request.data.get('pk', None):
-            return self.queryset.get(pk=self.request.data.get('pk'))
-        return super().get_object()
+        """Returns the object for the view.
+
+        The object is cached against the view, to prevent repeated lookups within a single request.
+        """
+        if getattr(self, '_object', None) is None:
+            if self.request.data.get('pk', None):
+                self._object = self.get_queryset().get(pk=self.request.data.get('pk'))
+            else:
+                self._object = super().get_object()
+
+        return self._object
 
     def perform_update(self, serializer):
         """Activate the plugin."""
@@ -155,7 +169,7 @@ class PluginSettingList(ListAPI):
     - only accessible by staff users
     """
 
-    queryset = PluginSetting.objects.all()
+    queryset = PluginSetting.objects.all().select_related('plugin')
     serializer_class = PluginSerializers.PluginSettingSerializer
 
     permission_classes = [
@@ -163,7 +177,7 @@ class PluginSettingList(ListAPI):
     ]
 
     filter_backends = [
-        DjangoFilterBackend,
+        InvenTreeNoHTMLFilterBackend,
     ]
 
     filterset_fields = [
@@ -222,7 +236,7 @@ class PluginSettingDetail(RetrieveUpdateAPI):
     Note that these cannot be created or deleted via the API
     """
 
-    queryset = PluginSetting.objects.all()
+    queryset = PluginSetting.objects.all().select_related('plugin')
     serializer_class = PluginSerializers.PluginSettingSerializer
 
     def get_object(self):
@@ -256,13 +270,13 @@ plugin_api_urls = [
     re_path(r'^plugins/', include([
         # Plugin settings URLs
         re_path(r'^settings/', include([
-            re_path(r'^(?P<plugin>[-\w]+)/(?P<key>\w+)/', PluginSettingDetail.as_view(), name='api-plugin-setting-detail'),    # Used for admin interface
+            path('<slug:plugin>/<str:key>/', PluginSettingDetail.as_view(), name='api-plugin-setting-detail'),    # Used for admin interface
             re_path(r'^.*$', PluginSettingList.as_view(), name='api-plugin-setting-list'),
         ])),
 
         # Detail views for a single PluginConfig item
         path(r'<int:pk>/', include([
-            re_path(r'^settings/(?P<key>\w+)/', PluginSettingDetail.as_view(), name='api-plugin-setting-detail-pk'),
+            path('settings/<str:key>/', PluginSettingDetail.as_view(), name='api-plugin-setting-detail-pk'),
             re_path(r'^activate/', PluginActivate.as_view(), name='api-plugin-detail-activate'),
             re_path(r'^.*$', PluginDetail.as_view(), name='api-plugin-detail'),
         ])),
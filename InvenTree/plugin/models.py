@@ -1,6 +1,5 @@
 """Plugin model definitions."""
 
-import inspect
 import warnings
 
 from django.conf import settings
@@ -60,9 +59,7 @@ class PluginConfig(InvenTree.models.MetadataMixin, models.Model):
     def mixins(self):
         """Returns all registered mixins."""
         try:
-            if inspect.isclass(self.plugin):
-                return self.plugin.get_registered_mixins(self, with_base=True, with_cls=False)
-            return self.plugin.get_registered_mixins(with_base=True, with_cls=False)
+            return registry.get_plugin_mixins(self.key)
         except (AttributeError, ValueError):  # pragma: no cover
             return {}
 
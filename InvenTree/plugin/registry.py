@@ -6,6 +6,7 @@
 
 import imp
 import importlib
+import inspect
 import logging
 import os
 import subprocess
@@ -53,6 +54,7 @@ class PluginsRegistry:
         self.plugins: Dict[str, InvenTreePlugin] = {}           # List of active instances
         self.plugins_inactive: Dict[str, InvenTreePlugin] = {}  # List of inactive instances
         self.plugins_full: Dict[str, InvenTreePlugin] = {}      # List of all plugin instances
+        self.plugins_mixins: Dict[str, Dict] = {}               # Cache of registered mixins for each plugin
 
         self.plugin_modules: List[InvenTreePlugin] = []         # Holds all discovered plugins
         self.mixin_modules: Dict[str, Any] = {}                 # Holds all discovered mixins
@@ -74,6 +76,24 @@ class PluginsRegistry:
 
         return self.plugins[slug]
 
+    def get_plugin_mixins(self, slug):
+        """Return the registered mixins for the plugin named by 'slug'.
+
+        The result is cached, as the registered mixins only change when the registry is reloaded.
+        """
+        if slug not in self.plugins_mixins:
+            plugin = self.plugins_full.get(slug, None)
+
+            # Plugins which were not initialized (e.g. inactive plugins) have no registered mixins
+            if plugin is None or inspect.isclass(plugin):
+                mixins = {}
+            else:
+                mixins = plugin.get_registered_mixins(with_base=True, with_cls=False)
+
+            self.plugins_mixins[slug] = mixins
+
+        return self.plugins_mixins[slug]
+
     def set_plugin_state(self, slug, state):
         """Set the state(active/inactive) of a plugin.
 
@@ -162,6 +182,9 @@ class PluginsRegistry:
             if full_reload:
                 full_reload = False
 
+        # Registered mixins must be re-evaluated for the loaded plugins
+        self.plugins_mixins = {}
+
         # ensure plugins_loaded is True
         self.plugins_loaded = True
 
@@ -575,6 +598,7 @@ class PluginsRegistry:
         self.plugins: Dict[str, InvenTreePlugin] = {}
         self.plugins_inactive: Dict[str, InvenTreePlugin] = {}
         self.plugins_full: Dict[str, InvenTreePlugin] = {}
+        self.plugins_mixins: Dict[str, Dict] = {}
 
     def _update_urls(self):
         from InvenTree.urls import frontendpatterns as urlpattern
@@ -1,9 +1,13 @@
 """JSON serializers for plugin app."""
 
+import os
+import re
 import subprocess
+from collections import deque
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -13,6 +17,35 @@ from common.serializers import GenericReferencedSettingSerializer
 from InvenTree.tasks import check_for_migrations, offload_task
 from plugin.models import NotificationUserSetting, PluginConfig, PluginSetting
 
+# Base command used for installing plugin packages
+PIP_INSTALL_COMMAND = ('python', '-m', 'pip', 'install')
+
+# Maximum number of lines of pip output returned to the client
+PIP_OUTPUT_LINES = 200
+
+# Identifiers for plugin packages installed from a VCS provider
+VCS_IDENTIFIER_REGEX = re.compile(r'git\+https|hg\+https|svn\+svn')
+
+
+def offload_migration_check():
+    """Offload a check for outstanding migrations to the background worker."""
+    offload_task(check_for_migrations, worker=True)
+
+
+def queue_migration_check():
+    """Check for outstanding migrations once the current transaction is committed.
+
+    Multiple plugin installations within a single transaction only result in a single check.
+    """
+    connection = transaction.get_connection()
+
+    # A check is already queued for this transaction
+    # (callbacks are discarded if the transaction or savepoint is rolled back)
+    if any(callback[1] is offload_migration_check for callback in connection.run_on_commit):
+        return
+
+    transaction.on_commit(offload_migration_check)
+
 
 class MetadataSerializer(serializers.ModelSerializer):
     """Serializer class for model metadata API access."""
@@ -39,9 +72,7 @@ class MetadataSerializer(serializers.ModelSerializer):
         """
         if self.partial:
             # Default behaviour is to "merge" new data in
-            metadata = instance.metadata.copy() if instance.metadata else {}
-            metadata.update(data['metadata'])
-            data['metadata'] = metadata
+            data['metadata'] = {**(instance.metadata or {}), **data['metadata']}
 
         return super().update(instance, data)
 
@@ -129,7 +160,7 @@ class PluginConfigInstallSerializer(serializers.Serializer):
 
         if url:
             # use custom registration / VCS
-            if True in [identifier in url for identifier in ['git+https', 'hg+https', 'svn+svn', ]]:
+            if VCS_IDENTIFIER_REGEX.search(url):
                 # using a VCS provider
                 if packagename:
                     install_name.append(f'{packagename}@{url}')
@@ -147,33 +178,37 @@ class PluginConfigInstallSerializer(serializers.Serializer):
             # use pypi
             install_name.append(packagename)
 
-        command = 'python -m pip install'.split()
-        command.extend(install_name)
+        command = [*PIP_INSTALL_COMMAND, *install_name]
         ret = {'command': ' '.join(command)}
         success = False
         # execute pypi
-        try:
-            result = subprocess.check_output(command, cwd=settings.BASE_DIR.parent)
-            ret['result'] = str(result, 'utf-8')
+        # (only the last lines of output are retained, to bound memory usage for long installs)
+        with subprocess.Popen(command, cwd=settings.BASE_DIR.parent, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, encoding='utf-8', errors='replace') as process:
+            output = deque(process.stdout, maxlen=PIP_OUTPUT_LINES)
+
+        ret['result'] = ''.join(output)
+
+        if process.returncode == 0:
             ret['success'] = True
             success = True
-        except subprocess.CalledProcessError as error:  # pragma: no cover
-            ret['result'] = str(error.output, 'utf-8')
+        else:  # pragma: no cover
             ret['error'] = True
 
         # save plugin to plugin_file if installed successful
         if success:
-            # Read content of plugin file
-            plg_lines = open(settings.PLUGIN_FILE).readlines()
-            with open(settings.PLUGIN_FILE, "a") as plugin_file:
-                # Check if last line has a newline
-                if plg_lines[-1][-1:] != '\n':
-                    plugin_file.write('\n')
+            with open(settings.PLUGIN_FILE, 'a+b') as plugin_file:
+                # Check if the file ends with a newline (only the last byte is read)
+                if os.fstat(plugin_file.fileno()).st_size > 0:
+                    plugin_file.seek(-1, os.SEEK_END)
+
+                    if plugin_file.read(1) != b'\n':
+                        plugin_file.write(b'\n')
+
                 # Write new plugin to file
-                plugin_file.write(f'{" ".join(install_name)}  # Installed {timezone.now()} by {str(self.context["request"].user)}\n')
+                plugin_file.write(f'{" ".join(install_name)}  # Installed {timezone.now()} by {str(self.context["request"].user)}\n'.encode())
 
         # Check for migrations
-        offload_task(check_for_migrations, worker=True)
+        queue_migration_check()
 
         return ret
 
@@ -1,5 +1,8 @@
 """Tests for general API tests for the plugin app."""
 
+from unittest import mock
+
+from django.db import transaction
 from django.urls import reverse
 
 from rest_framework.exceptions import NotFound
@@ -7,6 +10,7 @@ from rest_framework.exceptions import NotFound
 from InvenTree.unit_test import InvenTreeAPITestCase, PluginMixin
 from plugin.api import check_plugin
 from plugin.models import PluginConfig
+from plugin.serializers import queue_migration_check
 
 
 class PluginDetailAPITest(PluginMixin, InvenTreeAPITestCase):
@@ -90,6 +94,23 @@ class PluginDetailAPITest(PluginMixin, InvenTreeAPITestCase):
 
         self.assertEqual(data['confirm'][0].title().upper(), 'Installation not confirmed'.upper())
 
+    def test_plugin_install_migration_check(self):
+        """Test that multiple installs within a single transaction only check for migrations once."""
+
+        with mock.patch('plugin.serializers.offload_task') as offload:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                # A check queued within a savepoint which is rolled back is discarded
+                with self.assertRaises(ValueError):
+                    with transaction.atomic():
+                        queue_migration_check()
+                        raise ValueError()
+
+                queue_migration_check()
+                queue_migration_check()
+
+            self.assertEqual(len(callbacks), 1)
+            self.assertEqual(offload.call_count, 1)
+
     def test_plugin_activate(self):
         """Test the plugin activate."""
 
@@ -176,6 +197,19 @@ class PluginDetailAPITest(PluginMixin, InvenTreeAPITestCase):
             plg_inactive.save()
         self.assertEqual(cm.warning.args[0], 'A reload was triggered')
 
+    def test_plugin_list_mixin(self):
+        """Test filtering the plugin list by mixin."""
+        url = reverse('api-plugin-list')
+
+        response = self.get(url, {'mixin': 'settings'}, expected_code=200)
+        self.assertGreater(len(response.data), 0)
+
+        for result in response.data:
+            self.assertIn('settings', result['mixins'])
+
+        response = self.get(url, {'mixin': 'no-such-mixin'}, expected_code=200)
+        self.assertEqual(len(response.data), 0)
+
     def test_check_plugin(self):
         """Test check_plugin function."""
 
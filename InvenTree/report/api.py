@@ -184,10 +184,12 @@ class ReportPrintMixin:
         # Start with a default report name
         report_name = "report.pdf"
 
+        # The same report template is rendered against each item
+        report = self.get_object()
+
         try:
             # Merge one or more PDF files into a single download
             for item in items_to_print:
-                report = self.get_object()
                 report.object_to_print = item
 
                 report_name = report.generate_filename(request)
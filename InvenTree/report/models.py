@@ -4,11 +4,14 @@ import datetime
 import logging
 import os
 import sys
+from functools import lru_cache
+from pathlib import PurePosixPath
 
 from django.conf import settings
 from django.core.cache import cache
 from django.core.validators import FileExtensionValidator
 from django.db import models
+from django.db.models import F
 from django.template import Context, Template
 from django.template.loader import render_to_string
 from django.urls import reverse
@@ -26,6 +29,7 @@ from plugin.registry import registry
 
 try:
     from django_weasyprint import WeasyTemplateResponseMixin
+    from django_weasyprint.views import WeasyTemplateResponse
 except OSError as err:  # pragma: no cover
     print("OSError: {e}".format(e=err))
     print("You may require some further system packages to be installed.")
@@ -35,6 +39,51 @@ except OSError as err:  # pragma: no cover
 logger = logging.getLogger("inventree")
 
 
+@lru_cache(maxsize=128)
+def get_filename_template(pattern):
+    """Return a compiled Template for the provided filename pattern.
+
+    Compiled templates are cached, as the same pattern is used for every report rendered against a template.
+    """
+    return Template(pattern)
+
+
+def rename_report_file(filename, existing, *subdirs, clear_cache=True):
+    """Construct the storage path for an uploaded report file.
+
+    If the uploaded file has the *same* filename as the existing file,
+    the original file is deleted from the media directory.
+
+    Arguments:
+        filename: The name of the uploaded file
+        existing: The name of the existing file (if any)
+        subdirs: Subdirectories (under 'report') where the file is stored
+        clear_cache: If True, clear any cached data for this file
+
+    Returns:
+        The path (relative to the media directory) where the file will be stored
+    """
+    filename = PurePosixPath(filename).name
+
+    path = str(PurePosixPath('report', *subdirs, filename))
+
+    # A new instance has no existing file, so there is nothing to remove
+    if existing and filename == str(existing):
+        # The media directory is already an absolute path, no need to resolve it here
+        fullpath = settings.MEDIA_ROOT.joinpath(path)
+
+        try:
+            os.remove(fullpath)
+            logger.info(f"Deleting existing report file: '{filename}'")
+        except FileNotFoundError:
+            pass
+
+    if clear_cache:
+        cache.delete(path)
+
+    return path
+
+
 def rename_template(instance, filename):
     """Helper function for 'renaming' uploaded report files.
 
@@ -79,9 +128,65 @@ def validate_stock_location_report_filters(filters):
     return validateFilterString(filters, model=stock.models.StockLocation)
 
 
+class WeasyprintReportResponse(WeasyTemplateResponse):
+    """Response class for a rendered PDF report.
+
+    The WeasyPrint document is only rendered once, and then reused
+    (e.g. when a report is both attached to an item and merged into a combined PDF).
+    """
+
+    def get_url_fetcher(self):
+        """Return a URL fetcher which caches fetched resources against the request.
+
+        When printing multiple reports in a single request,
+        shared resources (e.g. images and assets) are only fetched once.
+        """
+        fetcher = super().get_url_fetcher()
+
+        if not hasattr(self._request, '_inventree_report_resources'):
+            self._request._inventree_report_resources = {}
+
+        resources = self._request._inventree_report_resources
+
+        def url_fetcher(url, *args, **kwargs):
+            """Fetch the resource at the provided URL, or return the cached copy"""
+            if url not in resources:
+                result = fetcher(url, *args, **kwargs)
+
+                # File objects can only be read once, so store the file contents instead
+                if 'file_obj' in result:
+                    with result.pop('file_obj') as file_obj:
+                        result['string'] = file_obj.read()
+
+                resources[url] = result
+
+            return dict(resources[url])
+
+        return url_fetcher
+
+    def get_font_config(self):
+        """Return the font configuration for rendering this report.
+
+        Constructing a font configuration is expensive, so it is shared by all reports rendered within a single request.
+        """
+        if not hasattr(self._request, '_inventree_report_font_config'):
+            self._request._inventree_report_font_config = super().get_font_config()
+
+        return self._request._inventree_report_font_config
+
+    def get_document(self):
+        """Return the rendered WeasyPrint document for this response."""
+        if getattr(self, '_document', None) is None:
+            self._document = super().get_document()
+
+        return self._document
+
+
 class WeasyprintReportMixin(WeasyTemplateResponseMixin):
     """Class for rendering a HTML template to a PDF."""
 
+    response_class = WeasyprintReportResponse
+
     pdf_filename = 'report.pdf'
     pdf_attachment = True
 
@@ -103,9 +208,14 @@ class ReportBase(models.Model):
     def save(self, *args, **kwargs):
         """Perform additional actions when the report is saved"""
         # Increment revision number
-        self.revision += 1
-
-        super().save()
+        if not self._state.adding:
+            # Perform the increment within the database, so that concurrent updates are not lost
+            self.revision = F('revision') + 1
+            super().save(*args, **kwargs)
+            self.refresh_from_db(fields=['revision'])
+        else:
+            self.revision += 1
+            super().save(*args, **kwargs)
 
     def __str__(self):
         """Format a string representation of a report instance"""
@@ -118,25 +228,7 @@ class ReportBase(models.Model):
 
     def rename_file(self, filename):
         """Function for renaming uploaded file"""
-
-        filename = os.path.basename(filename)
-
-        path = os.path.join('report', 'report_template', self.getSubdir(), filename)
-
-        fullpath = settings.MEDIA_ROOT.joinpath(path).resolve()
-
-        # If the report file is the *same* filename as the one being uploaded,
-        # remove the original one from the media directory
-        if str(filename) == str(self.template):
-
-            if fullpath.exists():
-                logger.info(f"Deleting existing report template: '{filename}'")
-                os.remove(fullpath)
-
-        # Ensure that the cache is cleared for this template!
-        cache.delete(fullpath)
-
-        return path
+        return rename_report_file(filename, self.template, 'report_template', self.getSubdir())
 
     @property
     def extension(self):
@@ -203,15 +295,39 @@ class ReportTemplateBase(MetadataMixin, ReportBase):
         """Supply context data to the template for rendering."""
         return {}
 
+    @staticmethod
+    def get_default_page_size(request):
+        """Return the default page size for reports.
+
+        The setting value is stored against the request, so that it is only looked up once
+        when multiple reports are rendered within a single request.
+        """
+        if not hasattr(request, '_inventree_report_page_size'):
+            request._inventree_report_page_size = common.models.InvenTreeSetting.get_setting('REPORT_DEFAULT_PAGE_SIZE')
+
+        return request._inventree_report_page_size
+
     def context(self, request):
-        """All context to be passed to the renderer."""
+        """All context to be passed to the renderer.
+
+        The context is cached against the request and the object being printed,
+        as it is required multiple times when rendering a single report (e.g. filename generation and rendering).
+        """
+        cached = getattr(self, '_context_cache', None)
+
+        if cached is not None and cached[0] is request and cached[1] is self.object_to_print:
+            return cached[2]
+
         # Generate custom context data based on the particular report subclass
         context = self.get_context_data(request)
 
         context['base_url'] = get_base_url(request=request)
-        context['date'] = datetime.datetime.now().date()
-        context['datetime'] = datetime.datetime.now()
-        context['default_page_size'] = common.models.InvenTreeSetting.get_setting('REPORT_DEFAULT_PAGE_SIZE')
+        # Use a single timestamp, so that 'date' and 'datetime' are consistent
+        now = datetime.datetime.now()
+
+        context['date'] = now.date()
+        context['datetime'] = now
+        context['default_page_size'] = self.get_default_page_size(request)
         context['report_description'] = self.description
         context['report_name'] = self.name
         context['report_revision'] = self.revision
@@ -225,15 +341,18 @@ class ReportTemplateBase(MetadataMixin, ReportBase):
             # Let each plugin add its own context data
             plugin.add_report_context(self, self.object_to_print, request, context)
 
+        self._context_cache = (request, self.object_to_print, context)
+
         return context
 
     def generate_filename(self, request, **kwargs):
         """Generate a filename for this report."""
-        template_string = Template(self.filename_pattern)
+        template_string = get_filename_template(self.filename_pattern)
 
         ctx = self.context(request)
 
-        context = Context(ctx)
+        # Copy the (cached) context data, so that it is not modified by the template
+        context = Context(dict(ctx))
 
         return template_string.render(context)
 
@@ -308,27 +427,38 @@ class TestReport(ReportTemplateBase):
         help_text=_('Include test results for stock items installed inside assembled item')
     )
 
-    def get_test_keys(self, stock_item):
+    def get_test_keys(self, stock_item, test_templates=None, test_results=None):
         """Construct a flattened list of test 'keys' for this StockItem:
 
         - First, any 'required' tests
         - Second, any 'non required' tests
         - Finally, any test results which do not match a test
+
+        Arguments:
+            stock_item: The StockItem to construct test keys for
+            test_templates: (Optional) list of test templates for the StockItem part, if already fetched
+            test_results: (Optional) list of test results for the StockItem, if already fetched
         """
 
-        keys = []
+        if test_templates is None:
+            test_templates = list(stock_item.part.getTestTemplates())
+
+        # Use a dict (rather than a list) to de-duplicate keys, while preserving insertion order
+        keys = {}
 
-        for test in stock_item.part.getTestTemplates(required=True):
-            if test.key not in keys:
-                keys.append(test.key)
+        for test in test_templates:
+            if test.required:
+                keys.setdefault(test.key, None)
 
-        for test in stock_item.part.getTestTemplates(required=False):
-            if test.key not in keys:
-                keys.append(test.key)
+        for test in test_templates:
+            if not test.required:
+                keys.setdefault(test.key, None)
 
-        for result in stock_item.testResultList(include_installed=self.include_installed):
-            if result.key not in keys:
-                keys.append(result.key)
+        if test_results is None:
+            test_results = stock_item.testResultList(include_installed=self.include_installed)
+
+        for result in test_results:
+            keys.setdefault(result.key, None)
 
         return list(keys)
 
@@ -336,16 +466,23 @@ class TestReport(ReportTemplateBase):
         """Return custom context data for the TestReport template"""
         stock_item = self.object_to_print
 
+        # Fetch the test templates once, and use them for each of the test template context variables
+        test_templates = list(stock_item.part.getTestTemplates())
+
+        # Similarly, the test results are only fetched once
+        test_results = stock_item.testResultMap(include_installed=self.include_installed)
+        test_result_list = list(test_results.values())
+
         return {
             'stock_item': stock_item,
             'serial': stock_item.serial,
             'part': stock_item.part,
             'parameters': stock_item.part.parameters_map(),
-            'test_keys': self.get_test_keys(stock_item),
-            'test_template_list': stock_item.part.getTestTemplates(),
-            'test_template_map': stock_item.part.getTestTemplateMap(),
-            'results': stock_item.testResultMap(include_installed=self.include_installed),
-            'result_list': stock_item.testResultList(include_installed=self.include_installed),
+            'test_keys': self.get_test_keys(stock_item, test_templates=test_templates, test_results=test_result_list),
+            'test_template_list': test_templates,
+            'test_template_map': {template.key: template for template in test_templates},
+            'results': test_results,
+            'result_list': test_result_list,
             'installed_items': stock_item.get_installed_items(cascade=True),
         }
 
@@ -383,9 +520,9 @@ class BuildReport(ReportTemplateBase):
         return {
             'build': my_build,
             'part': my_build.part,
-            'build_outputs': my_build.build_outputs.all(),
-            'line_items': my_build.build_lines.all(),
-            'bom_items': my_build.part.get_bom_items(),
+            'build_outputs': my_build.build_outputs.all().select_related('part', 'location'),
+            'line_items': my_build.build_lines.all().select_related('bom_item', 'bom_item__sub_part'),
+            'bom_items': my_build.part.get_bom_items().select_related('sub_part'),
             'reference': my_build.reference,
             'quantity': my_build.quantity,
             'title': str(my_build),
@@ -422,7 +559,7 @@ class BillOfMaterialsReport(ReportTemplateBase):
         return {
             'part': part,
             'category': part.category,
-            'bom_items': part.get_bom_items(),
+            'bom_items': part.get_bom_items().select_related('sub_part'),
         }
 
 
@@ -455,7 +592,7 @@ class PurchaseOrderReport(ReportTemplateBase):
 
         return {
             'description': order.description,
-            'lines': order.lines,
+            'lines': order.lines.all().select_related('part', 'part__part'),
             'extra_lines': order.extra_lines,
             'order': order,
             'reference': order.reference,
@@ -494,7 +631,7 @@ class SalesOrderReport(ReportTemplateBase):
         return {
             'customer': order.customer,
             'description': order.description,
-            'lines': order.lines,
+            'lines': order.lines.all().select_related('part'),
             'extra_lines': order.extra_lines,
             'order': order,
             'reference': order.reference,
@@ -535,7 +672,7 @@ class ReturnOrderReport(ReportTemplateBase):
             'description': order.description,
             'reference': order.reference,
             'customer': order.customer,
-            'lines': order.lines,
+            'lines': order.lines.all().select_related('item', 'item__part'),
             'extra_lines': order.extra_lines,
             'title': str(order),
         }
@@ -543,25 +680,7 @@ class ReturnOrderReport(ReportTemplateBase):
 
 def rename_snippet(instance, filename):
     """Function to rename a report snippet once uploaded"""
-
-    filename = os.path.basename(filename)
-
-    path = os.path.join('report', 'snippets', filename)
-
-    fullpath = settings.MEDIA_ROOT.joinpath(path).resolve()
-
-    # If the snippet file is the *same* filename as the one being uploaded,
-    # delete the original one from the media directory
-    if str(filename) == str(instance.snippet):
-
-        if fullpath.exists():
-            logger.info(f"Deleting existing snippet file: '{filename}'")
-            os.remove(fullpath)
-
-    # Ensure that the cache is deleted for this snippet
-    cache.delete(fullpath)
-
-    return path
+    return rename_report_file(filename, instance.snippet, 'snippets')
 
 
 class ReportSnippet(models.Model):
@@ -582,21 +701,7 @@ class ReportSnippet(models.Model):
 
 def rename_asset(instance, filename):
     """Function to rename an asset file when uploaded"""
-
-    filename = os.path.basename(filename)
-
-    path = os.path.join('report', 'assets', filename)
-
-    # If the asset file is the *same* filename as the one being uploaded,
-    # delete the original one from the media directory
-    if str(filename) == str(instance.asset):
-        fullpath = settings.MEDIA_ROOT.joinpath(path).resolve()
-
-        if fullpath.exists():
-            logger.info(f"Deleting existing asset file: '{filename}'")
-            os.remove(fullpath)
-
-    return path
+    return rename_report_file(filename, instance.asset, 'assets', clear_cache=False)
 
 
 class ReportAsset(models.Model):
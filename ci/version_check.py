@@ -10,13 +10,17 @@ tagged branch:
 
 """
 
-import json
 import os
 import re
 import sys
 
 import requests
 
+# Regular expressions used to extract version information
+TAG_REGEX = re.compile(r"(\d+)\.(\d+)\.(\d+)")
+VERSION_REGEX = re.compile(r"^(\d+)\.(\d+)\.(\d+)(?: dev)?$")
+SW_VERSION_REGEX = re.compile(r'^INVENTREE_SW_VERSION = "(.*)"')
+
 
 def get_existing_release_tags():
     """Request information on existing releases via the GitHub API"""
@@ -30,25 +34,33 @@ def get_existing_release_tags():
             "Authorization": f"Bearer {token}"
         }
 
-    response = requests.get('https://api.github.com/repos/inventree/inventree/releases', headers=headers)
+    # Request the maximum page size, and follow pagination links to retrieve all releases
+    url = 'https://api.github.com/repos/inventree/inventree/releases?per_page=100'
+
+    data = []
+
+    while url:
+        response = requests.get(url, headers=headers)
 
-    if response.status_code != 200:
-        raise ValueError(f'Unexpected status code from GitHub API: {response.status_code}')
+        if response.status_code != 200:
+            raise ValueError(f'Unexpected status code from GitHub API: {response.status_code}')
 
-    data = json.loads(response.text)
+        data.extend(response.json())
+
+        url = response.links.get('next', {}).get('url', None)
 
     # Return a list of all tags
     tags = []
 
     for release in data:
         tag = release['tag_name'].strip()
-        match = re.match(r"^.*(\d+)\.(\d+)\.(\d+).*$", tag)
+        match = TAG_REGEX.search(tag)
 
-        if len(match.groups()) != 3:
+        if not match:
             print(f"Version '{tag}' did not match expected pattern")
             continue
 
-        tags.append([int(x) for x in match.groups()])
+        tags.append(tuple(int(x) for x in match.groups()))
 
     return tags
 
@@ -62,26 +74,25 @@ def check_version_number(version_string, allow_duplicate=False):
     print(f"Checking version '{version_string}'")
 
     # Check that the version string matches the required format
-    match = re.match(r"^(\d+)\.(\d+)\.(\d+)(?: dev)?$", version_string)
+    match = VERSION_REGEX.match(version_string)
 
     if not match or len(match.groups()) != 3:
         raise ValueError(f"Version string '{version_string}' did not match required pattern")
 
-    version_tuple = [int(x) for x in match.groups()]
+    version_tuple = tuple(int(x) for x in match.groups())
 
     # Look through the existing releases
     existing = get_existing_release_tags()
 
-    # Assume that this is the highest release, unless told otherwise
-    highest_release = True
+    if not allow_duplicate and version_tuple in existing:
+        raise ValueError(f"Duplicate release '{version_string}' exists!")
 
-    for release in existing:
-        if release == version_tuple and not allow_duplicate:
-            raise ValueError(f"Duplicate release '{version_string}' exists!")
+    # This is the highest release, unless a newer release already exists
+    newest_release = max(existing, default=version_tuple)
+    highest_release = newest_release <= version_tuple
 
-        if release > version_tuple:
-            highest_release = False
-            print(f"Found newer release: {str(release)}")
+    if not highest_release:
+        print(f"Found newer release: {str(newest_release)}")
 
     return highest_release
 
@@ -112,16 +123,17 @@ if __name__ == '__main__':
 
     with open(version_file, 'r') as f:
 
-        text = f.read()
-
-        # Extract the InvenTree software version
-        results = re.findall(r'INVENTREE_SW_VERSION = "(.*)"', text)
+        # Extract the InvenTree software version (stop reading once it has been found)
+        for line in f:
+            match = SW_VERSION_REGEX.match(line)
 
-        if len(results) != 1:
-            print(f"Could not find INVENTREE_SW_VERSION in {version_file}")
-            sys.exit(1)
+            if match:
+                version = match.group(1)
+                break
 
-        version = results[0]
+    if version is None:
+        print(f"Could not find INVENTREE_SW_VERSION in {version_file}")
+        sys.exit(1)
 
     print(f"InvenTree Version: '{version}'")
 